@@ -3,182 +3,331 @@
 Generate API endpoints from package metadata
 """
 
+import gzip
+import hashlib
 import json
+import mmap
 import os
+import shutil
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 
-def load_all_packages() -> List[Dict[str, Any]]:
-    """Load all package metadata files"""
-    packages = []
-    packages_dir = Path("packages")
-    
-    for package_file in packages_dir.rglob("*.json"):
-        try:
-            with open(package_file, 'r', encoding='utf-8') as f:
-                package_data = json.load(f)
-                packages.append(package_data)
-        except Exception as e:
-            print(f"Error loading {package_file}: {e}")
-    
-    return packages
+# orjson parses and serializes JSON several times faster than the stdlib
+# and works directly on bytes; fall back to stdlib json when unavailable
+try:
+    import orjson
 
-def generate_popular_packages(packages: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Generate popular packages API endpoint"""
-    
-    # Sort by popularity rank (lower number = more popular)
-    popular = sorted(
-        [p for p in packages if 'popularity' in p and 'rank' in p['popularity']], 
-        key=lambda x: x['popularity']['rank']
-    )
-    
-    popular_packages = []
-    categories = {}
-    
-    for pkg in popular:
-        pop_data = pkg['popularity']
-        pkg_info = {
-            "rank": pop_data['rank'],
-            "name": pkg['name'],
-            "display_name": pkg['display_name'],
-            "category": pkg['category'],
-            "downloads_per_month": pop_data.get('downloads_per_month', 0),
-            "search_frequency": pop_data.get('search_frequency', 0),
-            "cross_platform": bool(pkg.get('cross_platform'))
-        }
-        popular_packages.append(pkg_info)
-        
-        # Group by category
-        category = pkg['category']
-        if category not in categories:
-            categories[category] = []
-        categories[category].append(pkg['name'])
-    
-    return {
-        "version": "1.0",
-        "last_updated": datetime.now(timezone.utc).isoformat(),
-        "total_packages": len(popular_packages),
-        "popular_packages": popular_packages,
-        "categories": categories
-    }
+    def json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
 
-def generate_cross_platform_mappings(packages: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Generate cross-platform mappings API endpoint"""
-    
-    mappings = {}
-    reverse_mappings = {"linux": {}, "macos": {}, "windows": {}}
-    
-    for pkg in packages:
-        if 'cross_platform' not in pkg:
-            continue
-            
-        name = pkg['name']
-        cross_platform = pkg['cross_platform']
-        mappings[name] = cross_platform
-        
-        # Build reverse mappings
-        for platform, managers in cross_platform.items():
-            if platform not in reverse_mappings:
-                reverse_mappings[platform] = {}
-                
-            for manager, package_names in managers.items():
-                if manager not in reverse_mappings[platform]:
-                    reverse_mappings[platform][manager] = {}
-                    
-                for package_name in package_names:
-                    reverse_mappings[platform][manager][package_name] = name
-    
-    return {
-        "version": "1.0",
-        "last_updated": datetime.now(timezone.utc).isoformat(),
-        "mappings": mappings,
-        "reverse_mappings": reverse_mappings
-    }
+    def json_dumps(data: Any, pretty: bool = True) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
 
-def generate_security_data(packages: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Generate security scores API endpoint"""
-    
+except ImportError:
+    def json_loads(data: bytes) -> Any:
+        # stdlib json can't decode from a buffer, so memory-mapped input
+        # costs one copy here
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def json_dumps(data: Any, pretty: bool = True) -> bytes:
+        return json.dumps(
+            data,
+            indent=2 if pretty else None,
+            separators=None if pretty else (',', ':'),
+            ensure_ascii=False
+        ).encode('utf-8')
+
+# Endpoints people read in a browser stay indented; the rest are written
+# compact with a gzipped copy alongside, since JSON size drives client load time
+PRETTY_ENDPOINTS = {'popular.json', 'categories.json', 'security.json'}
+
+# NumPy turns the per-package security-score branch cascade into one
+# vectorized pass; plain Python is used when it's missing or the list is small
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Bucket names in ascending score order, matching the thresholds below
+SECURITY_BUCKETS = ("poor", "fair", "good", "excellent")
+SECURITY_THRESHOLDS = (6.0, 8.0, 9.0)
+
+# Below this many packages the NumPy array round-trip costs more than it saves
+VECTORIZE_MIN_PACKAGES = 1024
+
+def bucket_security_scores(names: List[str], scores: List[float]) -> Dict[str, List[str]]:
+    """Group package names into security buckets by score"""
+    buckets = {"excellent": [], "good": [], "fair": [], "poor": []}
+
+    if np is not None and len(scores) >= VECTORIZE_MIN_PACKAGES:
+        indices = np.digitize(np.asarray(scores), SECURITY_THRESHOLDS)
+        for name, index in zip(names, indices):
+            buckets[SECURITY_BUCKETS[index]].append(name)
+    else:
+        for name, score in zip(names, scores):
+            if score >= 9.0:
+                buckets["excellent"].append(name)
+            elif score >= 8.0:
+                buckets["good"].append(name)
+            elif score >= 6.0:
+                buckets["fair"].append(name)
+            else:
+                buckets["poor"].append(name)
+
+    return buckets
+
+def iter_json_files(root: str) -> Iterator[str]:
+    """Yield paths of all .json files under root via an os.scandir walk
+
+    Faster than Path.rglob: entries are filtered on the string name and no
+    Path objects are built for non-matches.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.json'):
+                    yield entry.path
+
+# Files above this size are memory-mapped so orjson decodes straight out of
+# the OS page cache instead of through an intermediate bytes object
+MMAP_MIN_BYTES = 256 * 1024
+
+def load_package_file(package_file: str) -> Optional[Dict[str, Any]]:
+    """Load a single package metadata file, returning None on failure"""
+    try:
+        with open(package_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return json_loads(memoryview(mm))
+            return json_loads(f.read())
+    except Exception as e:
+        print(f"Error loading {package_file}: {e}")
+        return None
+
+# Stat digest of the package files from the last run; when it matches,
+# every endpoint would come out identical and generation can be skipped
+FINGERPRINT_FILE = Path("api/.fingerprint")
+
+def compute_fingerprint(package_files: List[str]) -> str:
+    """Hash the stat signature of every package file
+
+    Any file added, removed or modified since the last run changes the
+    digest.
+    """
+    digest = hashlib.blake2b()
+    for package_file in sorted(package_files):
+        stat = os.stat(package_file)
+        digest.update(f"{package_file}:{stat.st_mtime_ns}:{stat.st_size}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def load_all_packages(package_files: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Load the given package metadata files in parallel
+
+    Returns the parsed packages and the paths they came from, in matching
+    order; files that fail to parse appear in neither.
+    """
+    # Each file is parsed independently, so loading is IO-bound and
+    # parallelizes cleanly across a thread pool
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        loaded = [
+            (package_file, package)
+            for package_file, package in zip(package_files, executor.map(load_package_file, package_files))
+            if package is not None
+        ]
+
+    return [package for _, package in loaded], [package_file for package_file, _ in loaded]
+
+def build_all_endpoints(packages: List[Dict[str, Any]], last_updated: str) -> Dict[str, Dict[str, Any]]:
+    """Build the popular, cross-platform, security and categories endpoints
+
+    A single pass over the package list feeds the accumulators for every
+    endpoint, instead of one full traversal per endpoint.
+    """
+    popular = []
+    mappings = {}
+    reverse_flat = {}
     security_scores = {}
-    security_categories = {"excellent": [], "good": [], "fair": [], "poor": []}
+    secured_names = []
+    secured_scores = []
     vulnerability_alerts = []
-    
+    categories = defaultdict(list)
+
     for pkg in packages:
-        if 'security' not in pkg:
-            continue
-            
+        # Bind repeatedly-read fields to locals once per package; a local
+        # read is far cheaper than a dict subscript
         name = pkg['name']
-        security = pkg['security']
-        
-        security_scores[name] = security
-        
-        # Categorize by security score
-        score = security.get('score', 0)
-        if score >= 9.0:
-            security_categories["excellent"].append(name)
-        elif score >= 8.0:
-            security_categories["good"].append(name)
-        elif score >= 6.0:
-            security_categories["fair"].append(name)
-        else:
-            security_categories["poor"].append(name)
-            
-        # Check for vulnerabilities
-        if security.get('vulnerabilities') and len(security['vulnerabilities']) > 0:
-            vulnerability_alerts.extend(security['vulnerabilities'])
-    
-    return {
-        "version": "1.0",
-        "last_updated": datetime.now(timezone.utc).isoformat(),
-        "security_scores": security_scores,
-        "security_categories": security_categories,
-        "vulnerability_alerts": vulnerability_alerts,
-        "security_guidelines": {
-            "minimum_score": 7.0,
-            "recommended_score": 8.5,
-            "update_frequency": "daily"
-        }
-    }
+        popularity = pkg.get('popularity')
+        cross_platform = pkg.get('cross_platform')
+        security = pkg.get('security')
 
-def generate_categories(packages: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Generate categories API endpoint"""
-    
-    categories = {}
-    
-    for pkg in packages:
-        category = pkg.get('category', 'other')
-        if category not in categories:
-            categories[category] = []
-        categories[category].append({
-            "name": pkg['name'],
+        # Popular packages: project just the fields the endpoint needs into
+        # a flat tuple, so the sort and the regroup below never touch the
+        # full package dicts again
+        if popularity is not None and 'rank' in popularity:
+            popular.append((
+                popularity['rank'],
+                name,
+                pkg['display_name'],
+                pkg['category'],
+                popularity.get('downloads_per_month', 0),
+                popularity.get('search_frequency', 0),
+                bool(cross_platform)
+            ))
+
+        # Cross-platform mappings
+        if cross_platform is not None:
+            mappings[name] = cross_platform
+
+            # One flat insert per entry here; the nested shape is rebuilt
+            # in a single regroup pass after the loop
+            for platform, managers in cross_platform.items():
+                for manager, package_names in managers.items():
+                    for package_name in package_names:
+                        reverse_flat[(platform, manager, package_name)] = name
+
+        # Security scores
+        if security is not None:
+            security_scores[name] = security
+            secured_names.append(name)
+            secured_scores.append(security.get('score', 0))
+
+            vulnerabilities = security.get('vulnerabilities')
+            if vulnerabilities:
+                vulnerability_alerts.extend(vulnerabilities)
+
+        # Categories
+        categories[pkg.get('category', 'other')].append({
+            "name": name,
             "display_name": pkg['display_name'],
             "description": pkg['description']
         })
-    
-    return {
-        "version": "1.0",
-        "last_updated": datetime.now(timezone.utc).isoformat(),
-        "categories": categories,
-        "total_categories": len(categories),
-        "total_packages": len(packages)
-    }
 
-def generate_all_packages(packages: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Generate complete packages list API endpoint"""
-    
+    # Regroup the flat reverse mapping into its nested output shape; the
+    # standard platforms always appear, even when empty
+    reverse_mappings = {"linux": {}, "macos": {}, "windows": {}}
+    for (platform, manager, package_name), name in reverse_flat.items():
+        reverse_mappings.setdefault(platform, {}).setdefault(manager, {})[package_name] = name
+
+    security_categories = bucket_security_scores(secured_names, secured_scores)
+
+    # Sort by popularity rank once (lower number = more popular)
+    popular.sort(key=itemgetter(0))
+
+    popular_packages = []
+    popular_categories = defaultdict(list)
+
+    for rank, name, display_name, category, downloads, search_frequency, has_cross_platform in popular:
+        popular_packages.append({
+            "rank": rank,
+            "name": name,
+            "display_name": display_name,
+            "category": category,
+            "downloads_per_month": downloads,
+            "search_frequency": search_frequency,
+            "cross_platform": has_cross_platform
+        })
+
+        # Group by category in rank order
+        popular_categories[category].append(name)
+
     return {
-        "version": "1.0", 
-        "last_updated": datetime.now(timezone.utc).isoformat(),
-        "total_packages": len(packages),
-        "packages": packages
+        "popular.json": {
+            "version": "1.0",
+            "last_updated": last_updated,
+            "total_packages": len(popular_packages),
+            "popular_packages": popular_packages,
+            "categories": dict(popular_categories)
+        },
+        "cross-platform.json": {
+            "version": "1.0",
+            "last_updated": last_updated,
+            "mappings": mappings,
+            "reverse_mappings": reverse_mappings
+        },
+        "security.json": {
+            "version": "1.0",
+            "last_updated": last_updated,
+            "security_scores": security_scores,
+            "security_categories": security_categories,
+            "vulnerability_alerts": vulnerability_alerts,
+            "security_guidelines": {
+                "minimum_score": 7.0,
+                "recommended_score": 8.5,
+                "update_frequency": "daily"
+            }
+        },
+        "categories.json": {
+            "version": "1.0",
+            "last_updated": last_updated,
+            "categories": dict(categories),
+            "total_categories": len(categories),
+            "total_packages": len(packages)
+        }
     }
 
+def write_all_packages(output_path: Path, package_files: List[str], last_updated: str) -> None:
+    """Stream the complete packages list API endpoint to disk
+
+    Source files are already valid JSON, so their bytes are copied straight
+    into the packages array without re-parsing or re-serializing anything;
+    peak memory stays at roughly one file. Only files that parsed
+    successfully during loading are passed in here.
+    """
+    with open(output_path, 'wb') as f:
+        f.write(b'{"version":"1.0","last_updated":')
+        f.write(json_dumps(last_updated, pretty=False))
+        f.write(b',"total_packages":')
+        f.write(str(len(package_files)).encode('ascii'))
+        f.write(b',"packages":[')
+        for i, package_file in enumerate(package_files):
+            if i:
+                f.write(b',')
+            with open(package_file, 'rb') as src:
+                shutil.copyfileobj(src, f)
+        f.write(b']}')
+
+def write_endpoint(api_dir: Path, filename: str, data: Dict[str, Any]) -> Path:
+    """Serialize and write one endpoint, plus a gzip copy when compact"""
+    output_path = api_dir / filename
+    pretty = filename in PRETTY_ENDPOINTS
+    output_path.write_bytes(json_dumps(data, pretty=pretty))
+    if not pretty:
+        write_gzip_copy(output_path)
+    return output_path
+
+def write_gzip_copy(output_path: Path) -> None:
+    """Write a gzipped copy of an endpoint file next to the original"""
+    gz_path = output_path.with_name(output_path.name + '.gz')
+    with open(output_path, 'rb') as src:
+        with gzip.open(gz_path, 'wb', compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst)
+
 def main():
     """Generate all API endpoints"""
     os.chdir(Path(__file__).parent.parent)
-    
+
+    package_files = list(iter_json_files("packages"))
+
+    # Short-circuit: nothing to regenerate when no package file changed
+    fingerprint = compute_fingerprint(package_files)
+    try:
+        if FINGERPRINT_FILE.read_text() == fingerprint:
+            print("✅ Package data unchanged since last run, endpoints are up to date")
+            return
+    except OSError:
+        pass
+
     print("📦 Loading package metadata...")
-    packages = load_all_packages()
+    packages, package_files = load_all_packages(package_files)
     print(f"✅ Loaded {len(packages)} packages")
     
     # Create API directory structure
@@ -186,24 +335,34 @@ def main():
     api_dir.mkdir(parents=True, exist_ok=True)
     
     # Generate API endpoints
-    endpoints = {
-        "popular.json": generate_popular_packages(packages),
-        "cross-platform.json": generate_cross_platform_mappings(packages),
-        "security.json": generate_security_data(packages),
-        "categories.json": generate_categories(packages),
-        "all.json": generate_all_packages(packages)
-    }
-    
+    # One timestamp per run so every endpoint reports the same update time
+    last_updated = datetime.now(timezone.utc).isoformat()
+
+    endpoints = build_all_endpoints(packages, last_updated)
+
+    # all.json is copied straight from the source files, so the parsed
+    # packages can be dropped before the writes
+    del packages
+
     print("🔄 Generating API endpoints...")
-    
-    for filename, data in endpoints.items():
-        output_path = api_dir / filename
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ Generated {output_path}")
-    
+
+    # The writes are independent, and orjson releases the GIL while
+    # serializing, so encoding overlaps with disk IO across the pool
+    all_path = api_dir / "all.json"
+
+    with ThreadPoolExecutor(max_workers=len(endpoints) + 1) as executor:
+        all_future = executor.submit(write_all_packages, all_path, package_files, last_updated)
+
+        for output_path in executor.map(lambda item: write_endpoint(api_dir, *item), endpoints.items()):
+            print(f"✅ Generated {output_path}")
+
+        all_future.result()
+
+    write_gzip_copy(all_path)
+    print(f"✅ Generated {all_path}")
+
+    FINGERPRINT_FILE.write_text(fingerprint)
+
     print("🎉 API generation complete!")
 
 if __name__ == "__main__":
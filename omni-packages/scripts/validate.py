@@ -5,17 +5,36 @@ Package metadata validation script for Omni Packages Database
 
 import json
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any
 import jsonschema
 
+# orjson parses JSON several times faster than the stdlib and works
+# directly on bytes; fall back to stdlib json when unavailable
+try:
+    import orjson
+
+    def json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+except ImportError:
+    def json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+# Compiled once at import; fastjsonschema inlines the pattern into its
+# generated validator, and the stdlib fallback below caches compilations
+NAME_PATTERN = re.compile(r"^[a-z0-9-_]+$")
+
 # Package metadata JSON schema
 PACKAGE_SCHEMA = {
     "type": "object",
     "required": ["name", "display_name", "category", "description", "cross_platform"],
     "properties": {
-        "name": {"type": "string", "pattern": "^[a-z0-9-_]+$"},
+        "name": {"type": "string", "pattern": NAME_PATTERN.pattern},
         "display_name": {"type": "string"},
         "category": {"type": "string"},
         "description": {"type": "string"},
@@ -87,29 +106,93 @@ PACKAGE_SCHEMA = {
     }
 }
 
-def validate_package(file_path: Path) -> List[str]:
+# Compile the schema once at import time so per-file validation runs a
+# specialized validator function instead of re-walking the schema each call
+try:
+    import fastjsonschema
+
+    # fastjsonschema enforces format keywords by default, but the stdlib
+    # validator ignores them without a FormatChecker; neutralize them so
+    # both paths accept the same files regardless of what is installed
+    _schema_validator = fastjsonschema.compile(
+        PACKAGE_SCHEMA,
+        formats={
+            "uri": lambda value: True,
+            "date": lambda value: True,
+            "date-time": lambda value: True,
+        },
+    )
+
+    def check_schema(data: Dict[str, Any]) -> List[str]:
+        try:
+            _schema_validator(data)
+            return []
+        except fastjsonschema.JsonSchemaException as e:
+            return [f"Schema validation error: {e.message}"]
+
+except ImportError:
+    @lru_cache(maxsize=None)
+    def _compile_pattern(pattern: str) -> "re.Pattern":
+        return re.compile(pattern)
+
+    def _cached_pattern(validator, pattern, instance, schema):
+        if validator.is_type(instance, "string") and not _compile_pattern(pattern).search(instance):
+            yield jsonschema.ValidationError(f"{instance!r} does not match {pattern!r}")
+
+    # Replace the default pattern keyword so regexes compile once per
+    # pattern instead of once per validated string
+    _CachedPatternValidator = jsonschema.validators.extend(
+        jsonschema.Draft7Validator, {"pattern": _cached_pattern}
+    )
+
+    jsonschema.Draft7Validator.check_schema(PACKAGE_SCHEMA)
+    _schema_validator = _CachedPatternValidator(PACKAGE_SCHEMA)
+
+    def check_schema(data: Dict[str, Any]) -> List[str]:
+        # iter_errors reports every violation in one pass instead of
+        # raising on the first, so a single run shows all problems
+        return [
+            f"Schema validation error: {e.message} at {list(e.absolute_path)}"
+            for e in _schema_validator.iter_errors(data)
+        ]
+
+def iter_json_files(root: str) -> Iterator[str]:
+    """Yield paths of all .json files under root via an os.scandir walk
+
+    Faster than Path.rglob: entries are filtered on the string name and no
+    Path objects are built for non-matches.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.json'):
+                    yield entry.path
+
+def validate_package(file_path: str) -> List[str]:
     """Validate a single package file"""
     errors = []
-    
+
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
+        with open(file_path, 'rb') as f:
+            data = json_loads(f.read())
+    except ValueError as e:
+        # Covers both json.JSONDecodeError and orjson.JSONDecodeError
         return [f"Invalid JSON: {e}"]
     except Exception as e:
         return [f"Error reading file: {e}"]
     
     # Validate against schema
-    try:
-        jsonschema.validate(data, PACKAGE_SCHEMA)
-    except jsonschema.ValidationError as e:
-        errors.append(f"Schema validation error: {e.message}")
+    errors.extend(check_schema(data))
     
     # Additional validation rules
     if 'name' in data:
         expected_filename = f"{data['name']}.json"
-        if file_path.name != expected_filename:
-            errors.append(f"Filename {file_path.name} doesn't match package name {data['name']}")
+        filename = os.path.basename(file_path)
+        if filename != expected_filename:
+            errors.append(f"Filename {filename} doesn't match package name {data['name']}")
     
     # Check cross-platform mappings
     if 'cross_platform' in data:
@@ -124,26 +207,73 @@ def validate_package(file_path: Path) -> List[str]:
     
     return errors
 
-def validate_all_packages() -> bool:
+# Validation results from previous runs, keyed by path, mtime and size so
+# any change to a file invalidates its entry
+CACHE_FILE = Path(".validate-cache.json")
+
+def load_validation_cache() -> Dict[str, List[str]]:
+    """Load cached validation results from a previous run"""
+    try:
+        return json_loads(CACHE_FILE.read_bytes())
+    except Exception:
+        return {}
+
+def save_validation_cache(cache: Dict[str, List[str]]) -> None:
+    """Persist validation results for the next run"""
+    try:
+        CACHE_FILE.write_text(json.dumps(cache))
+    except Exception as e:
+        print(f"Warning: could not write {CACHE_FILE}: {e}")
+
+def validate_all_packages(verbose: bool = False) -> bool:
     """Validate all package files in the repository"""
-    packages_dir = Path("packages")
     total_files = 0
     total_errors = 0
-    
+
     print("🔍 Validating package metadata...")
-    
-    for package_file in packages_dir.rglob("*.json"):
+
+    package_files = list(iter_json_files("packages"))
+
+    # Reuse cached results for files unchanged since the last run
+    cache = load_validation_cache()
+    cache_keys = []
+    results: List[Any] = []
+    uncached = []
+
+    for i, package_file in enumerate(package_files):
+        stat = os.stat(package_file)
+        key = f"{package_file}:{stat.st_mtime_ns}:{stat.st_size}"
+        cache_keys.append(key)
+        results.append(cache.get(key))
+        if key not in cache:
+            uncached.append(i)
+
+    # Files are validated independently, so the JSON parsing and schema
+    # checks run in parallel across a thread pool
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        for i, errors in zip(uncached, executor.map(validate_package, [package_files[i] for i in uncached])):
+            results[i] = errors
+
+    # Rewriting the cache from scratch drops entries for deleted or changed files
+    save_validation_cache(dict(zip(cache_keys, results)))
+
+    # Accumulate output and print it in one go; a print per file means a
+    # stdout flush per package, which adds up in CI log capture
+    lines = []
+
+    for package_file, errors in zip(package_files, results):
         total_files += 1
-        errors = validate_package(package_file)
-        
+
         if errors:
             total_errors += len(errors)
-            print(f"❌ {package_file}:")
-            for error in errors:
-                print(f"   • {error}")
-        else:
-            print(f"✅ {package_file}")
-    
+            lines.append(f"❌ {package_file}:")
+            lines.extend(f"   • {error}" for error in errors)
+        elif verbose:
+            lines.append(f"✅ {package_file}")
+
+    if lines:
+        print("\n".join(lines))
+
     print(f"\n📊 Validation Results:")
     print(f"   Files processed: {total_files}")
     print(f"   Errors found: {total_errors}")
@@ -158,8 +288,10 @@ def validate_all_packages() -> bool:
 def main():
     """Main validation function"""
     os.chdir(Path(__file__).parent.parent)
-    
-    if validate_all_packages():
+
+    verbose = "-v" in sys.argv or "--verbose" in sys.argv
+
+    if validate_all_packages(verbose=verbose):
         sys.exit(0)
     else:
         sys.exit(1)